@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
-import httpx
-from app.core.config import settings
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+import asyncio
+import json
+import time
+from app.core.rate_hub import RateHub, Subscription, get_rate_hub, parse_pair
+from app.core.currencies import CURRENCY_NAMES
+from app.models.ticker_index import get_ticker_index
 from typing import List, Dict
 
 router = APIRouter()
@@ -8,28 +12,102 @@ router = APIRouter()
 @router.get("/rates")
 async def get_exchange_rates(base_currency: str):
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://open.er-api.com/v6/latest/{base_currency}",
-                params={"apikey": settings.OPEN_EXCHANGE_RATES_API_KEY}
-            )
-            response.raise_for_status()
-            return response.json()
+        # Served from the shared rate hub cache, refreshed once per poll interval
+        return await get_rate_hub().get_rates(base_currency)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
+async def _forward_updates(websocket: WebSocket, subscription: Subscription):
+    while True:
+        rates = await subscription.next_update()
+        await websocket.send_json({
+            "type": "rates",
+            "rates": rates,
+            "timestamp": int(time.time()),
+        })
+
+async def _handle_commands(websocket: WebSocket, hub: RateHub, subscription: Subscription):
+    while True:
+        frame = await websocket.receive()
+        if frame["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(frame.get("code", 1000))
+
+        try:
+            if frame.get("text") is None:
+                raise ValueError("Only text frames with JSON messages are supported.")
+            message = json.loads(frame["text"])
+            action = message.get("action")
+            pairs = message.get("pairs")
+            parsed = [parse_pair(p) for p in pairs] if pairs is not None else None
+        except (ValueError, AttributeError, TypeError) as e:
+            await websocket.send_json({"type": "error", "detail": str(e)})
+            continue
+
+        if action == "subscribe" and parsed:
+            try:
+                hub.subscribe(subscription, parsed)
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+        elif action == "unsubscribe":
+            hub.unsubscribe(subscription, parsed)
+        else:
+            await websocket.send_json({
+                "type": "error",
+                "detail": "Expected {'action': 'subscribe' | 'unsubscribe', 'pairs': [...]}"
+            })
+
+@router.websocket("/ws")
+async def stream_rates(websocket: WebSocket):
+    """
+    Live rates over WebSocket.
+
+    Client messages:
+        {"action": "subscribe", "pairs": ["EUR/JPY", "USD/INR"]}
+        (supported currencies only, up to RATE_MAX_PAIRS_PER_SUBSCRIPTION pairs)
+        {"action": "unsubscribe", "pairs": ["EUR/JPY"]}   (omit pairs for all)
+
+    Server messages:
+        {"type": "rates", "rates": {"EUR/JPY": 161.2}, "timestamp": ...}
+        (only pairs whose value changed since the last push)
+        {"type": "error", "detail": "..."}
+    """
+    await websocket.accept()
+
+    hub = get_rate_hub()
+    subscription = hub.connect()
+    sender = asyncio.create_task(_forward_updates(websocket, subscription))
+    receiver = asyncio.create_task(_handle_commands(websocket, hub, subscription))
+
+    try:
+        # Whichever side stops first (client gone, failed send) ends the connection
+        done, pending = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                print(f"Rate stream closed after error: {error!r}")
+                try:
+                    await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+                except Exception:
+                    pass
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        hub.disconnect(subscription)
+
 @router.get("/supported")
 async def get_supported_currencies() -> List[Dict[str, str]]:
-    #This could be expanded to include more currency information
+    # Backed by the ticker index: currencies with a Yahoo USD leg we can forecast.
+    # Until the startup build has resolved anything, list the candidate set.
+    codes = get_ticker_index().supported()
+    if codes == ["USD"]:
+        codes = sorted(CURRENCY_NAMES)
+
     return [
-        {"code": "USD", "name": "US Dollar"},
-        {"code": "EUR", "name": "Euro"},
-        {"code": "GBP", "name": "British Pound"},
-        {"code": "JPY", "name": "Japanese Yen"},
-        {"code": "AUD", "name": "Australian Dollar"},
-        {"code": "CAD", "name": "Canadian Dollar"},
-        #Add more currencies as needed
-    ]
\ No newline at end of file
+        {"code": code, "name": CURRENCY_NAMES.get(code, code)}
+        for code in codes
+    ]
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Dict, Union
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from typing import List, Dict, Optional, Union
 from datetime import datetime, timedelta
-from app.models.fx_model import FXPair, FXFetcher
+from app.core.config import settings
+from app.core.upstream import Deadline, UpstreamUnavailable
+from app.models.fx_model import FXPair, TickerNotListedError
+from app.models.fx_upstream import get_fx_fetcher
+from app.models.ticker_index import get_ticker_index
+from app.models.stat_model import STAT_METHODS, StatForecaster, build_matrix
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import numpy as np
@@ -18,14 +23,17 @@ COMMON_CURRENCIES = {'USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD', 'CHF', 'CNY', 'HK
                      'TWD', 'DKK', 'PLN', 'THB', 'IDR', 'HUF', 'CZK', 'ILS', 'CLP', 'PHP',
                      'AED', 'COP', 'SAR', 'MYR', 'RON'}
 
-def simple_forecast(pair: FXPair, days: int = 30) -> List[Dict[str, Union[str, float]]]:
+def simple_forecast(
+    pair: FXPair,
+    days: int = 30,
+    deadline: Optional[Deadline] = None
+) -> List[Dict[str, Union[str, float]]]:
     """
     Simple but reliable forecast using historical data and trend analysis.
     Falls back when TFT model has issues.
     """
     # Fetch historical data
-    fetcher = FXFetcher(lookback_years=2)
-    historical = fetcher.fetch_daily(pair)
+    historical = get_fx_fetcher().fetch_daily(pair, deadline=deadline)
     
     if len(historical) < 30:
         raise ValueError("Insufficient historical data")
@@ -61,36 +69,83 @@ def simple_forecast(pair: FXPair, days: int = 30) -> List[Dict[str, Union[str, f
     
     return forecasts
 
-def cross_rate_forecast(base: str, quote: str, days: int = 30) -> List[Dict[str, Union[str, float]]]:
+def stat_forecast(
+    pair: FXPair,
+    days: int = 30,
+    method: str = "ewma",
+    deadline: Optional[Deadline] = None
+) -> List[Dict[str, Union[str, float]]]:
+    """
+    Fast statistical forecast (EWMA drift, AR(p) or GARCH volatility)
+    with p10 / p90 bands alongside the median rate.
+    """
+    frame = get_fx_fetcher().fetch_matrix([pair], deadline=deadline)
+    return _stat_rows(frame, days, method)
+
+def _stat_rows(
+    frame: pd.DataFrame,
+    days: int,
+    method: str
+) -> List[Dict[str, Union[str, float]]]:
+    """Fit `method` on a one-column rate history and format the quantiles."""
+    model = StatForecaster(method).fit(frame)
+    quantiles = model.predict(days).pair(frame.columns[0])
+
+    last_rate = frame.iloc[-1, 0]
+    today = datetime.now()
+
+    forecasts = [{
+        "date": today.strftime('%Y-%m-%d'),
+        "rate": round(float(last_rate), 6),
+        "p10": round(float(last_rate), 6),
+        "p90": round(float(last_rate), 6),
+    }]
+
+    for i, row in enumerate(quantiles.itertuples()):
+        forecasts.append({
+            "date": (today + timedelta(days=i+1)).strftime('%Y-%m-%d'),
+            "rate": round(float(row.p50), 6),
+            "p10": round(float(row.p10), 6),
+            "p90": round(float(row.p90), 6),
+        })
+
+    return forecasts
+
+def _usd_leg_history(code: str, fetcher, deadline: Deadline) -> Optional[pd.Series]:
+    """
+    USD/code history, using the ticker index to go straight to the
+    listed direction instead of guessing. None for USD itself.
+    """
+    if code == 'USD':
+        return None
+
+    pair, history = get_ticker_index().fetch_usd_leg(code, fetcher, deadline)
+    history = history if pair.base == 'USD' else 1.0 / history
+    return history.rename(code)
+
+def _usd_leg_rate(code: str, fetcher, deadline: Deadline) -> float:
+    """Latest USD/code rate."""
+    history = _usd_leg_history(code, fetcher, deadline)
+    return 1.0 if history is None else float(history.iloc[-1])
+
+def cross_rate_forecast(
+    base: str,
+    quote: str,
+    days: int = 30,
+    deadline: Optional[Deadline] = None
+) -> List[Dict[str, Union[str, float]]]:
     """
     Calculate cross rate using USD as intermediary.
     For example: JPY/AFN = (JPY/USD) * (USD/AFN)
     But since we only have USD/X pairs, we use: base/quote = (USD/quote) / (USD/base)
     """
-    fetcher = FXFetcher(lookback_years=2)
+    fetcher = get_fx_fetcher()
+    deadline = deadline or Deadline(fetcher.default_deadline)
     today = datetime.now()
     
-    # Get USD/base rate (e.g., USD/JPY)
-    try:
-        usd_base_pair = FXPair(base='USD', quote=base)
-        usd_base_hist = fetcher.fetch_daily(usd_base_pair)
-        usd_base_rate = float(usd_base_hist.iloc[-1])
-    except:
-        # Try reverse: base/USD
-        base_usd_pair = FXPair(base=base, quote='USD')
-        base_usd_hist = fetcher.fetch_daily(base_usd_pair)
-        usd_base_rate = 1.0 / float(base_usd_hist.iloc[-1])
-    
-    # Get USD/quote rate (e.g., USD/INR)
-    try:
-        usd_quote_pair = FXPair(base='USD', quote=quote)
-        usd_quote_hist = fetcher.fetch_daily(usd_quote_pair)
-        usd_quote_rate = float(usd_quote_hist.iloc[-1])
-    except:
-        # Try reverse: quote/USD
-        quote_usd_pair = FXPair(base=quote, quote='USD')
-        quote_usd_hist = fetcher.fetch_daily(quote_usd_pair)
-        usd_quote_rate = 1.0 / float(quote_usd_hist.iloc[-1])
+    # Get USD/base and USD/quote rates (e.g., USD/JPY, USD/INR)
+    usd_base_rate = _usd_leg_rate(base, fetcher, deadline)
+    usd_quote_rate = _usd_leg_rate(quote, fetcher, deadline)
     
     # Calculate cross rate: base/quote = (USD/quote) / (USD/base)
     cross_rate = usd_quote_rate / usd_base_rate
@@ -115,11 +170,56 @@ def cross_rate_forecast(base: str, quote: str, days: int = 30) -> List[Dict[str,
     
     return forecasts
 
+def cross_rate_stat_forecast(
+    base: str,
+    quote: str,
+    days: int = 30,
+    method: str = "ewma",
+    deadline: Optional[Deadline] = None
+) -> List[Dict[str, Union[str, float]]]:
+    """
+    Statistical forecast for a pair Yahoo does not list directly: both USD
+    legs are aligned like `fetch_matrix` does, the cross series is
+    base/quote = (USD/quote) / (USD/base), and the model is fit on that.
+    """
+    if base == quote:
+        # Identity pair: no legs to fit, the rate is exactly 1
+        today = datetime.now()
+        return [
+            {"date": (today + timedelta(days=i)).strftime('%Y-%m-%d'), "rate": 1.0, "p10": 1.0, "p90": 1.0}
+            for i in range(days + 1)
+        ]
+
+    fetcher = get_fx_fetcher()
+    deadline = deadline or Deadline(fetcher.default_deadline)
+
+    legs = {code: _usd_leg_history(code, fetcher, deadline) for code in (base, quote)}
+    frame = build_matrix([h for h in legs.values() if h is not None])
+
+    usd_base = frame[base] if legs[base] is not None else 1.0
+    usd_quote = frame[quote] if legs[quote] is not None else 1.0
+    cross = (usd_quote / usd_base).rename(f"{base}->{quote}").to_frame()
+
+    return _stat_rows(cross, days, method)
+
+async def _run_with_deadline(deadline: Deadline, func, *args):
+    """Run a blocking forecast in the executor, giving up when the deadline passes."""
+    loop = asyncio.get_event_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(executor, func, *args),
+            timeout=deadline.remaining()
+        )
+    except asyncio.TimeoutError:
+        raise UpstreamUnavailable("Forecast request deadline exceeded.")
+
 @router.post("/currency")
 async def forecast_currency(
     base_currency: str,
     target_currency: str,
-    days: int = 30
+    response: Response,
+    days: int = Query(30, ge=1, le=3650),
+    model: str = "trend"
 ) -> List[Dict[str, Union[str, float]]]:
     """
     Generate currency forecast using historical data and trend analysis.
@@ -128,41 +228,65 @@ async def forecast_currency(
         base_currency: Destination currency (e.g., "JPY")
         target_currency: Home currency (e.g., "INR")
         days: Number of days to forecast (default 30)
+        model: "trend" (linear trend) or a statistical model: "ewma", "ar", "garch"
     
     Returns:
-        List of forecasts with date and predicted exchange rate
+        List of forecasts with date and predicted exchange rate.
+        The X-FX-Stale header is "true" when upstream was unavailable and
+        the forecast was built from the last known good history.
     """
+    method = model.lower().strip()
+    if method != "trend" and method not in STAT_METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown model '{model}'. Use 'trend' or one of {', '.join(STAT_METHODS)}."
+        )
+
+    deadline = Deadline(settings.FX_REQUEST_DEADLINE_SECONDS)
+
     try:
         # Normalize currency codes
         base = base_currency.upper().strip()
         target = target_currency.upper().strip()
         
+        pair = FXPair(base=base, quote=target)
+        
         # Check if both currencies are common (direct pair likely available)
-        if base in COMMON_CURRENCIES and target in COMMON_CURRENCIES:
+        # and the direct ticker is not already known to be unlisted
+        if (base in COMMON_CURRENCIES and target in COMMON_CURRENCIES
+                and not get_ticker_index().is_missing(pair.ticker())):
             try:
                 # Try direct pair first
-                pair = FXPair(base=base, quote=target)
-                loop = asyncio.get_event_loop()
-                daily_forecast = await loop.run_in_executor(
-                    executor,
-                    simple_forecast,
-                    pair,
-                    days
-                )
+                if method == "trend":
+                    daily_forecast = await _run_with_deadline(
+                        deadline, simple_forecast, pair, days, deadline
+                    )
+                else:
+                    daily_forecast = await _run_with_deadline(
+                        deadline, stat_forecast, pair, days, method, deadline
+                    )
+                response.headers["X-FX-Stale"] = str(bool(deadline.stale)).lower()
                 return daily_forecast
+            except TickerNotListedError as e:
+                get_ticker_index().record_missing(pair)
+                print(f"Direct pair not listed, trying cross-rate: {e}")
             except Exception as e:
+                if deadline.expired:
+                    # Out of time – cross-rate would only make the client wait longer
+                    raise
                 print(f"Direct pair failed, trying cross-rate: {e}")
                 # Fall through to cross-rate
         
         # Use cross-rate via USD for exotic pairs
-        loop = asyncio.get_event_loop()
-        daily_forecast = await loop.run_in_executor(
-            executor,
-            cross_rate_forecast,
-            base,
-            target,
-            days
-        )
+        if method == "trend":
+            daily_forecast = await _run_with_deadline(
+                deadline, cross_rate_forecast, base, target, days, deadline
+            )
+        else:
+            daily_forecast = await _run_with_deadline(
+                deadline, cross_rate_stat_forecast, base, target, days, method, deadline
+            )
+        response.headers["X-FX-Stale"] = str(bool(deadline.stale)).lower()
         return daily_forecast
             
     except ValueError as e:
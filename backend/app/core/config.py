@@ -20,6 +20,25 @@ class Settings(BaseSettings):
     GOOGLE_AI_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
     
+    # Upstream FX fetching (Yahoo Finance)
+    FX_FETCH_TIMEOUT_SECONDS: float = 10.0
+    FX_REQUEST_DEADLINE_SECONDS: float = 20.0
+    FX_RETRY_ATTEMPTS: int = 3
+    FX_RETRY_BACKOFF_SECONDS: float = 0.5
+    FX_BREAKER_FAILURE_THRESHOLD: int = 5
+    FX_BREAKER_RESET_SECONDS: float = 60.0
+    FX_TICKER_INDEX_PATH: str = "data/ticker_index.json"
+    FX_TICKER_MISSING_TTL_SECONDS: float = 86400.0
+    FX_TICKER_INDEX_SAVE_SECONDS: float = 30.0
+    
+    # Live rates (open.er-api.com polling shared by REST and WebSocket)
+    RATE_POLL_INTERVAL_SECONDS: float = 60.0
+    RATE_MAX_PAIRS_PER_SUBSCRIPTION: int = 25
+    
+    # Torch CPU threads per worker process (0 = torch default)
+    TORCH_NUM_THREADS: int = 0
+    TORCH_INTEROP_THREADS: int = 0
+    
     # CORS Settings
     ALLOWED_ORIGINS: str = "http://localhost:5173"
     
@@ -0,0 +1,25 @@
+# Currency codes the app knows about, with display names
+from typing import Dict
+
+CURRENCY_NAMES: Dict[str, str] = {
+    "USD": "US Dollar", "EUR": "Euro", "GBP": "British Pound", "JPY": "Japanese Yen",
+    "AUD": "Australian Dollar", "CAD": "Canadian Dollar", "CHF": "Swiss Franc",
+    "CNY": "Chinese Yuan", "HKD": "Hong Kong Dollar", "NZD": "New Zealand Dollar",
+    "SEK": "Swedish Krona", "KRW": "South Korean Won", "SGD": "Singapore Dollar",
+    "NOK": "Norwegian Krone", "MXN": "Mexican Peso", "INR": "Indian Rupee",
+    "RUB": "Russian Ruble", "ZAR": "South African Rand", "TRY": "Turkish Lira",
+    "BRL": "Brazilian Real", "TWD": "New Taiwan Dollar", "DKK": "Danish Krone",
+    "PLN": "Polish Zloty", "THB": "Thai Baht", "IDR": "Indonesian Rupiah",
+    "HUF": "Hungarian Forint", "CZK": "Czech Koruna", "ILS": "Israeli New Shekel",
+    "CLP": "Chilean Peso", "PHP": "Philippine Peso", "AED": "UAE Dirham",
+    "COP": "Colombian Peso", "SAR": "Saudi Riyal", "MYR": "Malaysian Ringgit",
+    "RON": "Romanian Leu", "ARS": "Argentine Peso", "BGN": "Bulgarian Lev",
+    "EGP": "Egyptian Pound", "ISK": "Icelandic Krona", "KWD": "Kuwaiti Dinar",
+    "QAR": "Qatari Riyal", "VND": "Vietnamese Dong", "PKR": "Pakistani Rupee",
+    "NGN": "Nigerian Naira", "KES": "Kenyan Shilling", "MAD": "Moroccan Dirham",
+    "PEN": "Peruvian Sol", "LKR": "Sri Lankan Rupee", "BDT": "Bangladeshi Taka",
+    "NPR": "Nepalese Rupee", "UAH": "Ukrainian Hryvnia", "KZT": "Kazakhstani Tenge",
+    "JOD": "Jordanian Dinar", "OMR": "Omani Rial", "BHD": "Bahraini Dinar",
+    "AFN": "Afghan Afghani", "GHS": "Ghanaian Cedi", "TND": "Tunisian Dinar",
+    "XAF": "Central African CFA Franc",
+}
@@ -0,0 +1,217 @@
+# Shared live-rate polling: one upstream fetch per base, fanned out to subscribers
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.currencies import CURRENCY_NAMES
+
+RATES_URL = "https://open.er-api.com/v6/latest/{base}"
+
+
+def parse_pair(text: str) -> Tuple[str, str]:
+    """'EUR/JPY' → ('EUR', 'JPY')"""
+    base, sep, quote = text.upper().strip().partition("/")
+    if not sep or len(base) != 3 or len(quote) != 3:
+        raise ValueError(f"Invalid pair '{text}', expected e.g. 'EUR/JPY'.")
+    return base, quote
+
+
+class Subscription:
+    """
+    One connected client. Changes are merged into `pending` so a slow
+    client only ever receives the latest value per pair.
+    """
+
+    def __init__(self):
+        self.pairs: Set[Tuple[str, str]] = set()
+        self.last_sent: Dict[str, float] = {}
+        self.pending: Dict[str, float] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, changes: Dict[str, float]):
+        if changes:
+            self.pending.update(changes)
+            self.ready.set()
+
+    async def next_update(self) -> Dict[str, float]:
+        await self.ready.wait()
+        self.ready.clear()
+        update, self.pending = self.pending, {}
+        return update
+
+
+class RateHub:
+    """
+    Polls open.er-api.com once per interval for each base currency that
+    any subscriber needs, computes the subscribed pairs and pushes only
+    values that changed. REST lookups share the same per-base cache, so
+    upstream load follows the number of distinct bases, not clients.
+
+    Subscriptions accept only codes in `currencies` and at most
+    `max_pairs` pairs each, so the polled bases stay bounded. REST lookups
+    pass any well-formed code through to the upstream; the cache keeps
+    the `cache_size` most recently used bases.
+    """
+
+    def __init__(
+        self,
+        interval: float = 60.0,
+        currencies: Optional[Iterable[str]] = None,
+        max_pairs: int = 25,
+        cache_size: int = 128
+    ):
+        self.interval = interval
+        self.currencies = frozenset(currencies if currencies is not None else CURRENCY_NAMES)
+        self.max_pairs = max_pairs
+        self.cache_size = cache_size
+
+        self._client: Optional[httpx.AsyncClient] = None
+        # base -> (fetched_at, payload), least recently used first
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._poller: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    def _check(self, code: str):
+        if code not in self.currencies:
+            raise ValueError(f"Unsupported currency '{code}'.")
+
+    # ---------------- upstream ---------------- #
+
+    async def _fetch(self, base: str) -> Dict:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=10.0)
+
+        response = await self._client.get(
+            RATES_URL.format(base=base),
+            params={"apikey": settings.OPEN_EXCHANGE_RATES_API_KEY}
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        self._cache[base] = (time.monotonic(), payload)
+        self._cache.move_to_end(base)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return payload
+
+    async def get_rates(self, base: str, max_age: Optional[float] = None) -> Dict:
+        """Latest payload for `base`; concurrent callers share one fetch."""
+        base = base.upper().strip()
+        if not re.fullmatch(r"[A-Z]{3}", base):
+            raise ValueError(f"Invalid currency code '{base}'.")
+        max_age = self.interval if max_age is None else max_age
+
+        cached = self._cache.get(base)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            self._cache.move_to_end(base)
+            return cached[1]
+
+        task = self._inflight.get(base)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(base))
+            self._inflight[base] = task
+            task.add_done_callback(lambda _: self._inflight.pop(base, None))
+
+        return await asyncio.shield(task)
+
+    async def close(self):
+        if self._poller is not None:
+            self._poller.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---------------- subscriptions ---------------- #
+
+    def connect(self) -> Subscription:
+        subscription = Subscription()
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def disconnect(self, subscription: Subscription):
+        self._subscriptions.discard(subscription)
+
+    def subscribe(self, subscription: Subscription, pairs: Iterable[Tuple[str, str]]):
+        pairs = set(pairs)
+        for base, quote in pairs:
+            self._check(base)
+            self._check(quote)
+        if len(subscription.pairs | pairs) > self.max_pairs:
+            raise ValueError(f"At most {self.max_pairs} pairs per connection.")
+
+        subscription.pairs.update(pairs)
+
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self._poll())
+        self._wake.set()
+
+    def unsubscribe(self, subscription: Subscription, pairs: Optional[Iterable[Tuple[str, str]]] = None):
+        if pairs is None:
+            subscription.pairs.clear()
+        else:
+            subscription.pairs.difference_update(pairs)
+
+        active = {f"{b}/{q}" for b, q in subscription.pairs}
+        subscription.last_sent = {k: v for k, v in subscription.last_sent.items() if k in active}
+
+    # ---------------- polling ---------------- #
+
+    async def _refresh(self) -> Dict[str, Dict]:
+        bases = sorted({b for s in self._subscriptions for b, _ in s.pairs})
+        results = await asyncio.gather(
+            # Half-interval max age so timer jitter never skips a refresh
+            *(self.get_rates(base, max_age=self.interval / 2) for base in bases),
+            return_exceptions=True
+        )
+
+        tables = {}
+        for base, result in zip(bases, results):
+            if isinstance(result, Exception):
+                print(f"Rate refresh failed for {base}: {result}")
+            else:
+                tables[base] = result.get("rates", {})
+        return tables
+
+    def _fan_out(self, tables: Dict[str, Dict]):
+        for subscription in self._subscriptions:
+            changes = {}
+            for base, quote in subscription.pairs:
+                rate = tables.get(base, {}).get(quote)
+                if rate is None:
+                    continue
+                key = f"{base}/{quote}"
+                if subscription.last_sent.get(key) != rate:
+                    subscription.last_sent[key] = rate
+                    changes[key] = rate
+            subscription.push(changes)
+
+    async def _poll(self):
+        while any(s.pairs for s in self._subscriptions):
+            self._wake.clear()
+            self._fan_out(await self._refresh())
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+rate_hub: Optional[RateHub] = None
+
+
+def get_rate_hub() -> RateHub:
+    """Lazy initialization of the shared rate hub"""
+    global rate_hub
+    if rate_hub is None:
+        rate_hub = RateHub(
+            interval=settings.RATE_POLL_INTERVAL_SECONDS,
+            max_pairs=settings.RATE_MAX_PAIRS_PER_SUBSCRIPTION,
+        )
+    return rate_hub
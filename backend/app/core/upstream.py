@@ -0,0 +1,98 @@
+# Upstream access helpers: deadlines, circuit breaking, retry backoff
+import random
+import threading
+import time
+from typing import List, Optional
+
+
+class UpstreamUnavailable(ValueError):
+    """Upstream is unhealthy or the request ran out of time."""
+
+
+class Deadline:
+    """
+    Per-request time budget shared by every upstream call the request makes.
+    Also records the sources that had to be served from stale cache.
+    """
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+        self.stale: List[str] = []
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+
+class CircuitBreaker:
+    """
+    Classic closed → open → half-open breaker.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    calls fail fast for `reset_seconds`. Then a single trial call is let
+    through; its outcome closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """End a trial call whose outcome says nothing about upstream health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def backoff_delay(attempt: int, base: float, deadline: Optional[Deadline] = None, cap: float = 8.0) -> float:
+    """Exponential backoff with full jitter, never sleeping past the deadline."""
+    delay = random.uniform(0.0, min(cap, base * (2 ** attempt)))
+    if deadline is not None:
+        delay = min(delay, deadline.remaining())
+    return delay
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import logging
+import threading
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -15,6 +17,9 @@ from darts import TimeSeries
 from darts.models import TFTModel
 from darts.dataprocessing.transformers import Scaler
 
+from app.models.stat_model import STAT_METHODS, StatForecaster, build_matrix
+from app.models.tft_inference import TFTInference
+
 
 # ============================================================
 #  FX Pair – Currency Pair Representation
@@ -38,33 +43,86 @@ class FXPair:
 # ============================================================
 #  FX Fetcher – Handles yfinance download
 # ============================================================
+class NoDataError(ValueError):
+    """Yahoo answered but had no usable rows for the ticker."""
+
+
+class TickerNotListedError(NoDataError):
+    """yfinance reported the ticker itself as unknown to Yahoo."""
+
+
+# yfinance's wording when Yahoo has no such symbol. Anything else it reports
+# (timeouts, rate limits, connection errors) is an upstream failure.
+UNLISTED_MARKERS = ("possibly delisted", "no timezone found")
+
+
+class _DownloadErrors(logging.Handler):
+    """
+    Collects the per-ticker errors `yf.download` logs (and otherwise
+    swallows) on the calling thread, formatted "['TICKER']: <error>".
+    """
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        if record.thread == self.thread:
+            self.messages.append(record.getMessage())
+
+
+def download_with_errors(**kwargs) -> Tuple[pd.DataFrame, List[str]]:
+    """`yf.download(**kwargs)` plus the errors it logged for this call."""
+    errors = _DownloadErrors()
+    logger = logging.getLogger("yfinance")
+    logger.addHandler(errors)
+    try:
+        df = yf.download(**kwargs)
+    finally:
+        logger.removeHandler(errors)
+    return df, errors.messages
+
+
+def reported_unlisted(ticker: str, errors: List[str]) -> bool:
+    """True when yfinance said `ticker` is not listed on Yahoo."""
+    return any(
+        f"'{ticker}'" in message and any(marker in message for marker in UNLISTED_MARKERS)
+        for message in errors
+    )
+
+
 class FXFetcher:
     def __init__(self, lookback_years: int = 8):
         self.lookback_years = lookback_years
 
-    def fetch_daily(self, pair: FXPair) -> pd.Series:
+    def fetch_daily(self, pair: FXPair, timeout: float = 10) -> pd.Series:
         """
         Fetch daily FX rate series.
         Yahoo returns BASE per QUOTE (USD per 1 JPY).
+        `timeout` bounds the HTTP call made by yfinance (seconds).
         """
         end = datetime.utcnow()
         start = end - relativedelta(years=self.lookback_years)
         ticker = pair.ticker()
 
         # 🟩 FIX: Ensure correct download for all regions, handle retries
-        df = yf.download(
+        df, errors = download_with_errors(
             tickers=ticker,
             start=start,
             end=end,
             interval="1d",
             auto_adjust=True,
             progress=False,
-            threads=False  # prevents region-related failures
+            threads=False,  # prevents region-related failures
+            timeout=timeout
         )
 
-        # 🟥 If empty → Yahoo blocked or wrong ticker
+        # 🟥 If empty → wrong ticker, or Yahoo blocked / failing
         if df is None or df.empty:
-            raise ValueError(
+            if reported_unlisted(ticker, errors):
+                raise TickerNotListedError(f"Ticker '{ticker}' is not listed on Yahoo Finance.")
+            raise NoDataError(
                 f"Yahoo Finance returned no data for ticker '{ticker}'. "
                 "Try turning off VPN or running on mobile hotspot."
             )
@@ -80,7 +138,7 @@ class FXFetcher:
 
         close = close.dropna()
         if close.empty:
-            raise ValueError(f"No valid close prices for '{ticker}'.")
+            raise NoDataError(f"No valid close prices for '{ticker}'.")
 
         # Standardize index and fill missing days
         close.index = pd.to_datetime(close.index).tz_localize(None)
@@ -90,6 +148,13 @@ class FXFetcher:
 
         return close.astype(float)
 
+    def fetch_matrix(self, pairs: List[FXPair]) -> pd.DataFrame:
+        """
+        Fetch several pairs and align them into a dates × pairs matrix,
+        ready for `StatForecaster.fit`.
+        """
+        return build_matrix([self.fetch_daily(pair) for pair in pairs])
+
 
 # ============================================================
 #  Monthly forecast container
@@ -129,6 +194,21 @@ def ts_to_monthly(ts: TimeSeries) -> List[MonthlyForecast]:
     return forecasts
 
 
+def quantiles_to_monthly(df: pd.DataFrame) -> List[MonthlyForecast]:
+    """Daily p10 / p50 / p90 frame → monthly averages."""
+    monthly = df.resample("MS").mean()
+
+    return [
+        MonthlyForecast(
+            month=idx.strftime("%Y-%m"),
+            p10=float(row.p10),
+            p50=float(row.p50),
+            p90=float(row.p90),
+        )
+        for idx, row in monthly.iterrows()
+    ]
+
+
 # ============================================================
 #  Budget ranking logic
 # ============================================================
@@ -168,16 +248,29 @@ class FXService:
         input_chunk_length: int = 365,
         output_chunk_length: int = 180,
         n_epochs: int = 50,
-        seed: int = 42
+        seed: int = 42,
+        fallback_method: Optional[str] = "ewma",
+        fast_inference: bool = True,
+        quantize: bool = False
     ):
+        if fallback_method is not None and fallback_method not in STAT_METHODS:
+            raise ValueError(
+                f"Unknown fallback method '{fallback_method}'. Use one of {STAT_METHODS} or None."
+            )
+
         self.fetcher = FXFetcher(lookback_years)
         self.input_chunk_length = input_chunk_length
         self.output_chunk_length = output_chunk_length
         self.n_epochs = n_epochs
         self.seed = seed
+        self.fallback_method = fallback_method
+        self.fast_inference = fast_inference
+        self.quantize = quantize
 
         self._scaler: Optional[Scaler] = None
         self._model: Optional[TFTModel] = None
+        self._series: List[TimeSeries] = []
+        self._inference: Optional[TFTInference] = None
 
     # ---------------- helpers ---------------- #
 
@@ -200,31 +293,87 @@ class FXService:
             pl_trainer_kwargs={"enable_progress_bar": False},
         )
 
-    def _fit_tft(self, series: pd.Series):
-        ts = TimeSeries.from_series(series.astype(np.float32))
+    def _fit_tft(self, series: Union[pd.Series, List[pd.Series]]):
+        batch = series if isinstance(series, list) else [series]
+        self._series = [TimeSeries.from_series(s.astype(np.float32)) for s in batch]
 
         self._scaler = Scaler()
-        ts_scaled = self._scaler.fit_transform(ts)
+        ts_scaled = self._scaler.fit_transform(self._series)
 
         self._model = self._build_model()
         self._model.fit(ts_scaled, verbose=False)
 
-    def _predict_daily(self, days: int) -> TimeSeries:
+        self._inference = (
+            TFTInference(self._model, quantize=self.quantize) if self.fast_inference else None
+        )
+
+    def _predict_daily_many(self, days: int) -> List[TimeSeries]:
         if self._model is None or self._scaler is None:
             raise RuntimeError("Model has not been trained yet.")
 
-        pred_scaled = self._model.predict(days)
+        if self._inference is not None:
+            return self._inference.predict(self._series, days, self._scaler)
+
+        pred_scaled = self._model.predict(days, series=self._scaler.transform(self._series))
         return self._scaler.inverse_transform(pred_scaled)
 
+    def _predict_daily(self, days: int) -> TimeSeries:
+        return self._predict_daily_many(days)[0]
+
+    def _forecast_stat(self, series: List[pd.Series], method: str, days: int) -> Dict[str, List[MonthlyForecast]]:
+        forecast = StatForecaster(method).fit(build_matrix(series)).predict(days)
+        return {s.name: quantiles_to_monthly(forecast.pair(s.name)) for s in series}
+
     # ---------------- public API ---------------- #
 
-    def forecast_monthly(self, pair: FXPair, h_months: int = 12) -> List[MonthlyForecast]:
+    def forecast_monthly(
+        self,
+        pair: FXPair,
+        h_months: int = 12,
+        method: str = "tft"
+    ) -> List[MonthlyForecast]:
+        """
+        method="tft" trains the TFT; any of STAT_METHODS uses the fast
+        statistical tier directly. If TFT training or prediction fails,
+        `fallback_method` (when set) is used instead.
+        """
+        if method != "tft" and method not in STAT_METHODS:
+            raise ValueError(f"Unknown forecast method '{method}'. Use 'tft' or one of {STAT_METHODS}.")
+
         series = self.fetcher.fetch_daily(pair)
+        horizon_days = h_months * 30
 
-        self._fit_tft(series)
+        if method in STAT_METHODS:
+            return self._forecast_stat([series], method, horizon_days)[series.name][:h_months]
 
-        horizon_days = h_months * 30
-        pred_ts = self._predict_daily(horizon_days)
+        try:
+            self._fit_tft(series)
+            pred_ts = self._predict_daily(horizon_days)
+        except Exception as e:
+            if self.fallback_method is None:
+                raise
+            print(f"TFT forecast failed, using {self.fallback_method} fallback: {e}")
+            return self._forecast_stat([series], self.fallback_method, horizon_days)[series.name][:h_months]
 
         monthly = ts_to_monthly(pred_ts)
         return monthly[:h_months]
+
+    def forecast_monthly_many(self, pairs: List[FXPair], h_months: int = 12) -> Dict[str, List[MonthlyForecast]]:
+        """
+        One TFT trained across all pairs and predicted in a single batched
+        pass. Keyed by series name ("BASE->QUOTE").
+        """
+        series = [self.fetcher.fetch_daily(pair) for pair in pairs]
+        horizon_days = h_months * 30
+
+        try:
+            self._fit_tft(series)
+            preds = self._predict_daily_many(horizon_days)
+        except Exception as e:
+            if self.fallback_method is None:
+                raise
+            print(f"TFT forecast failed, using {self.fallback_method} fallback: {e}")
+            stat = self._forecast_stat(series, self.fallback_method, horizon_days)
+            return {name: monthly[:h_months] for name, monthly in stat.items()}
+
+        return {s.name: ts_to_monthly(p)[:h_months] for s, p in zip(series, preds)}
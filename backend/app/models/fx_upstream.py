@@ -0,0 +1,156 @@
+# fx_upstream.py
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.upstream import CircuitBreaker, Deadline, UpstreamUnavailable, backoff_delay
+from app.models.fx_model import FXFetcher, FXPair, TickerNotListedError
+from app.models.stat_model import build_matrix
+
+
+# ============================================================
+#  Guarded FX Fetcher – deadlines, breaker, stale fallback
+# ============================================================
+class GuardedFXFetcher(FXFetcher):
+    """
+    FXFetcher wrapped for request-path use.
+
+    - every download is bounded by the caller's `Deadline`
+    - a shared circuit breaker fails fast while Yahoo is unhealthy
+    - failures are retried a bounded number of times with jittered backoff
+    - when fresh data is unavailable the last good history is returned,
+      with `series.attrs["stale"] = True`
+
+    Only a ticker yfinance reports as unlisted ("possibly delisted", "no
+    timezone found") is passed straight through without touching the
+    breaker, so probing for the right ticker direction does not trip it.
+    Any other empty response is an upstream failure: counted and retried.
+    """
+
+    def __init__(
+        self,
+        lookback_years: int = 2,
+        fetch_timeout: float = 10.0,
+        default_deadline: float = 20.0,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        super().__init__(lookback_years)
+        self.fetch_timeout = fetch_timeout
+        self.default_deadline = default_deadline
+        self.attempts = attempts
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+
+        self._lock = threading.Lock()
+        self._last_good: Dict[str, Tuple[pd.Series, float]] = {}
+
+    # ---------------- helpers ---------------- #
+
+    def _remember(self, ticker: str, series: pd.Series):
+        with self._lock:
+            self._last_good[ticker] = (series, time.time())
+
+    def _serve_stale(self, ticker: str, deadline: Deadline, error: Exception) -> pd.Series:
+        with self._lock:
+            cached = self._last_good.get(ticker)
+
+        if cached is None:
+            raise error
+
+        series, fetched_at = cached
+        print(f"Serving stale history for {ticker}: {error}")
+        deadline.stale.append(ticker)
+
+        series = series.copy()
+        series.attrs["stale"] = True
+        series.attrs["fetched_at"] = fetched_at
+        return series
+
+    # ---------------- public API ---------------- #
+
+    def fetch_daily(
+        self,
+        pair: FXPair,
+        timeout: Optional[float] = None,
+        *,
+        deadline: Optional[Deadline] = None
+    ) -> pd.Series:
+        """
+        `timeout` caps each download attempt (default `fetch_timeout`);
+        `deadline` bounds the whole call, retries and backoff included.
+        """
+        deadline = deadline or Deadline(self.default_deadline)
+        timeout = self.fetch_timeout if timeout is None else timeout
+        ticker = pair.ticker()
+
+        error: Exception = UpstreamUnavailable(f"Deadline exceeded before fetching '{ticker}'.")
+
+        for attempt in range(self.attempts):
+            if deadline.expired:
+                break
+
+            if not self.breaker.allow():
+                error = UpstreamUnavailable(
+                    f"Yahoo Finance circuit open; not fetching '{ticker}'."
+                )
+                break
+
+            try:
+                series = super().fetch_daily(
+                    pair, timeout=min(timeout, deadline.remaining())
+                )
+            except TickerNotListedError:
+                # Unlisted ticker, not a health signal – nothing to retry
+                self.breaker.release()
+                raise
+            except Exception as e:
+                self.breaker.record_failure()
+                error = e
+            else:
+                self.breaker.record_success()
+                self._remember(ticker, series)
+                series = series.copy()
+                series.attrs["stale"] = False
+                return series
+
+            if attempt + 1 < self.attempts:
+                time.sleep(backoff_delay(attempt, self.backoff, deadline))
+
+        return self._serve_stale(ticker, deadline, error)
+
+    def fetch_matrix(self, pairs: List[FXPair], *, deadline: Optional[Deadline] = None) -> pd.DataFrame:
+        deadline = deadline or Deadline(self.default_deadline)
+        series = [self.fetch_daily(pair, deadline=deadline) for pair in pairs]
+
+        frame = build_matrix(series)
+        frame.attrs["stale"] = any(s.attrs.get("stale", False) for s in series)
+        return frame
+
+
+fx_fetcher: Optional[GuardedFXFetcher] = None
+
+
+def get_fx_fetcher() -> GuardedFXFetcher:
+    """Lazy initialization of the shared request-path fetcher"""
+    global fx_fetcher
+    if fx_fetcher is None:
+        fx_fetcher = GuardedFXFetcher(
+            lookback_years=2,
+            fetch_timeout=settings.FX_FETCH_TIMEOUT_SECONDS,
+            default_deadline=settings.FX_REQUEST_DEADLINE_SECONDS,
+            attempts=settings.FX_RETRY_ATTEMPTS,
+            backoff=settings.FX_RETRY_BACKOFF_SECONDS,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.FX_BREAKER_FAILURE_THRESHOLD,
+                reset_seconds=settings.FX_BREAKER_RESET_SECONDS,
+            ),
+        )
+    return fx_fetcher
@@ -0,0 +1,222 @@
+# stat_model.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+# z-score of the 90th percentile of a standard normal
+Z_90 = 1.2815515655446004
+
+STAT_METHODS = ("ewma", "ar", "garch")
+
+
+# ============================================================
+#  Quantile forecast container (dates × pairs)
+# ============================================================
+@dataclass
+class StatForecast:
+    p10: pd.DataFrame
+    p50: pd.DataFrame
+    p90: pd.DataFrame
+
+    def pair(self, name: str) -> pd.DataFrame:
+        """Quantile frame (p10 / p50 / p90 columns) for a single pair."""
+        return pd.DataFrame({
+            "p10": self.p10[name],
+            "p50": self.p50[name],
+            "p90": self.p90[name],
+        })
+
+
+# ============================================================
+#  Helpers
+# ============================================================
+def build_matrix(series: List[pd.Series]) -> pd.DataFrame:
+    """
+    Align daily series into a dates × pairs matrix.
+
+    Only the span covered by every pair is kept, so the models can
+    work on a dense rectangular array.
+    """
+    frame = pd.concat(series, axis=1).sort_index()
+    frame = frame.ffill().dropna()
+
+    if frame.empty:
+        raise ValueError("Pairs have no overlapping history.")
+
+    return frame.astype(float)
+
+
+def _ewm_weights(n: int, halflife: float) -> np.ndarray:
+    decay = 0.5 ** (1.0 / halflife)
+    w = decay ** np.arange(n - 1, -1, -1, dtype=float)
+    return w / w.sum()
+
+
+# ============================================================
+#  Statistical forecaster – closed form, vectorized over pairs
+# ============================================================
+class StatForecaster:
+    """
+    Lightweight forecasters fitted on daily log returns.
+
+    - "ewma":  exponentially weighted drift and volatility
+    - "ar":    AR(p) on returns, least squares solved for all pairs at once
+    - "garch": GARCH(1,1) volatility with variance targeting and fixed
+               persistence (RiskMetrics style), plus EWMA drift
+
+    Every method works on the full (T, N) return matrix, so fitting N
+    pairs costs a handful of NumPy calls rather than N model fits.
+    """
+
+    def __init__(
+        self,
+        method: str = "ewma",
+        halflife: float = 30.0,
+        ar_order: int = 2,
+        garch_alpha: float = 0.05,
+        garch_beta: float = 0.90,
+    ):
+        if method not in STAT_METHODS:
+            raise ValueError(f"Unknown statistical method '{method}'. Use one of {STAT_METHODS}.")
+
+        self.method = method
+        self.halflife = halflife
+        self.ar_order = ar_order
+        self.garch_alpha = garch_alpha
+        self.garch_beta = garch_beta
+
+        self._columns: pd.Index = pd.Index([])
+        self._last_date: pd.Timestamp | None = None
+        self._last_log: np.ndarray | None = None
+        self._returns: np.ndarray | None = None
+
+        # fitted state, shape (N,) unless noted
+        self._mu: np.ndarray | None = None
+        self._sigma2: np.ndarray | None = None
+        self._coef: np.ndarray | None = None        # (N, p + 1) for AR
+        self._next_var: np.ndarray | None = None    # GARCH one-step variance
+
+    # ---------------- fitting ---------------- #
+
+    def fit(self, frame: pd.DataFrame) -> "StatForecaster":
+        """Fit on a dates × pairs matrix of rates (see `build_matrix`)."""
+        if len(frame) < max(30, self.ar_order + 10):
+            raise ValueError("Insufficient historical data")
+
+        log_px = np.log(frame.to_numpy(dtype=float))
+        returns = np.diff(log_px, axis=0)
+
+        self._columns = frame.columns
+        self._last_date = pd.Timestamp(frame.index[-1])
+        self._last_log = log_px[-1]
+        self._returns = returns
+
+        if self.method == "ar":
+            self._fit_ar(returns)
+        else:
+            self._fit_ewma(returns)
+            if self.method == "garch":
+                self._fit_garch(returns)
+
+        return self
+
+    def _fit_ewma(self, returns: np.ndarray):
+        w = _ewm_weights(len(returns), self.halflife)[:, None]
+        self._mu = (w * returns).sum(axis=0)
+        self._sigma2 = (w * (returns - self._mu) ** 2).sum(axis=0)
+
+    def _fit_ar(self, returns: np.ndarray):
+        p = self.ar_order
+        T, N = returns.shape
+
+        # Lagged design, shape (N, T - p, p + 1): intercept then lags 1..p
+        lags = np.stack([returns[p - k:T - k] for k in range(1, p + 1)], axis=-1)
+        X = np.concatenate([np.ones((T - p, N, 1)), lags], axis=-1).transpose(1, 0, 2)
+        y = returns[p:].T[..., None]
+
+        # Batched normal equations with a tiny ridge for stability
+        XtX = X.transpose(0, 2, 1) @ X + 1e-10 * np.eye(p + 1)
+        Xty = X.transpose(0, 2, 1) @ y
+        coef = np.linalg.solve(XtX, Xty)[..., 0]
+
+        resid = y[..., 0] - (X @ coef[..., None])[..., 0]
+        self._coef = coef
+        self._sigma2 = (resid ** 2).sum(axis=1) / max(T - p - (p + 1), 1)
+
+    def _fit_garch(self, returns: np.ndarray):
+        a, b = self.garch_alpha, self.garch_beta
+        eps = returns - self._mu
+        long_var = eps.var(axis=0)
+        omega = (1.0 - a - b) * long_var
+
+        var = long_var.copy()
+        for e in eps:
+            var = omega + a * e ** 2 + b * var
+
+        self._sigma2 = long_var
+        self._next_var = var
+
+    # ---------------- prediction ---------------- #
+
+    def _cumulative_moments(self, days: int):
+        """Mean and variance of the cumulative log return, shape (days, N)."""
+        steps = np.arange(1, days + 1, dtype=float)[:, None]
+
+        if self.method == "ewma":
+            return self._mu * steps, self._sigma2 * steps
+
+        if self.method == "garch":
+            persistence = self.garch_alpha + self.garch_beta
+            decay = persistence ** (steps - 1)
+            step_var = self._sigma2 + decay * (self._next_var - self._sigma2)
+            return self._mu * steps, np.cumsum(step_var, axis=0)
+
+        # AR(p): recursive mean path and MA(∞) weights, both over all pairs
+        p = self.ar_order
+        intercept, phi = self._coef[:, 0], self._coef[:, 1:]
+        N = len(intercept)
+
+        history = self._returns[-p:][::-1].T.copy()     # (N, p), most recent first
+        psi_hist = np.zeros((N, p))
+        psi_hist[:, 0] = 1.0
+
+        means = np.empty((days, N))
+        psi = np.empty((days, N))
+        for k in range(days):
+            step = intercept + (phi * history).sum(axis=1)
+            means[k] = step
+            history = np.concatenate([step[:, None], history[:, :-1]], axis=1)
+
+            psi[k] = psi_hist[:, 0]
+            nxt = (phi * psi_hist).sum(axis=1)
+            psi_hist = np.concatenate([nxt[:, None], psi_hist[:, :-1]], axis=1)
+
+        # Var of the h-step cumulative return = sigma² · Σ_{m<h} (Σ_{i≤m} ψ_i)²
+        cum_psi = np.cumsum(psi, axis=0)
+        cum_var = self._sigma2 * np.cumsum(cum_psi ** 2, axis=0)
+        return np.cumsum(means, axis=0), cum_var
+
+    def predict(self, days: int) -> StatForecast:
+        if self._last_log is None:
+            raise RuntimeError("Model has not been fitted yet.")
+
+        mean, var = self._cumulative_moments(days)
+        sd = np.sqrt(np.maximum(var, 0.0))
+        centre = self._last_log + mean
+
+        index = pd.date_range(self._last_date + pd.Timedelta(days=1), periods=days, freq="D")
+
+        def frame(values: np.ndarray) -> pd.DataFrame:
+            return pd.DataFrame(np.exp(values), index=index, columns=self._columns)
+
+        return StatForecast(
+            p10=frame(centre - Z_90 * sd),
+            p50=frame(centre),
+            p90=frame(centre + Z_90 * sd),
+        )
@@ -0,0 +1,114 @@
+# tft_inference.py
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import pytorch_lightning as pl
+import torch
+from torch import nn
+
+from darts import TimeSeries
+from darts.models import TFTModel
+from darts.dataprocessing.transformers import Scaler
+
+
+# ============================================================
+#  Torch CPU thread sizing
+# ============================================================
+def configure_torch_threads(intra_op: int, inter_op: Optional[int] = None):
+    """
+    Pin torch's CPU thread pools. With several uvicorn workers per host,
+    torch's default (one intra-op thread per core, per process) makes the
+    workers fight over cores; size this to cores / workers.
+    """
+    if intra_op > 0:
+        torch.set_num_threads(intra_op)
+
+    if inter_op:
+        try:
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError as e:
+            # Can only be set once, before any inter-op parallel work started
+            print(f"Could not set torch inter-op threads: {e}")
+
+
+# ============================================================
+#  TFT Inference – batched, lean-trainer, optionally quantized
+# ============================================================
+class TFTInference:
+    """
+    CPU inference path for a trained TFTModel.
+
+    - one Lightning trainer (no logger, checkpoints, progress bar or model
+      summary) is built once and reused, instead of one per `predict`
+    - many series are predicted in a single batched forward pass
+    - many horizons are served from one prediction at the longest horizon
+    - `quantize=True` applies dynamic int8 quantization to the Linear and
+      LSTM layers. This replaces the model's network in place, so only
+      enable it on a model that will not be trained further.
+    """
+
+    def __init__(self, model: TFTModel, quantize: bool = False):
+        if model.model is None:
+            raise RuntimeError("Model has not been trained yet.")
+
+        self.model = model
+        self.quantized = quantize
+
+        if quantize:
+            # In place: a freshly trained module holds cached non-leaf
+            # tensors (attention mask) that cannot be deep-copied
+            model.model = torch.ao.quantization.quantize_dynamic(
+                model.model, {nn.Linear, nn.LSTM}, dtype=torch.qint8, inplace=True
+            )
+        model.model.eval()
+
+        self._trainer = pl.Trainer(
+            accelerator="cpu",
+            logger=False,
+            enable_progress_bar=False,
+            enable_model_summary=False,
+            enable_checkpointing=False,
+        )
+
+    def predict(
+        self,
+        series: Sequence[TimeSeries],
+        days: int,
+        scaler: Optional[Scaler] = None,
+        random_state: Optional[int] = None
+    ) -> List[TimeSeries]:
+        """
+        Forecast `days` ahead for every series in one forward pass.
+
+        Series are scaled with `scaler` (which must already be fitted on
+        them, one scaler state per series), or with a fresh Scaler fitted
+        here, and predictions are returned in the original units.
+        """
+        series = list(series)
+        if scaler is None:
+            scaler = Scaler()
+            scaled = scaler.fit_transform(series)
+        else:
+            scaled = scaler.transform(series)
+
+        preds = self.model.predict(
+            days,
+            series=scaled,
+            trainer=self._trainer,
+            batch_size=len(scaled),
+            verbose=False,
+            random_state=random_state,
+        )
+        return scaler.inverse_transform(preds)
+
+    def predict_horizons(
+        self,
+        series: Sequence[TimeSeries],
+        horizons: Sequence[int],
+        scaler: Optional[Scaler] = None
+    ) -> Dict[int, List[TimeSeries]]:
+        """Several horizons from a single prediction at the longest one."""
+        full = self.predict(series, max(horizons), scaler)
+        return {h: [ts[:h] for ts in full] for h in horizons}
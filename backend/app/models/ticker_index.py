@@ -0,0 +1,235 @@
+# ticker_index.py
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.currencies import CURRENCY_NAMES
+from app.core.upstream import Deadline
+from app.models.fx_model import (
+    FXPair, NoDataError, TickerNotListedError, download_with_errors, reported_unlisted
+)
+from app.models.fx_upstream import GuardedFXFetcher
+
+
+# ============================================================
+#  Ticker Index – which Yahoo symbol serves each currency's USD leg
+# ============================================================
+class TickerIndex:
+    """
+    Persistent map from currency code to the Yahoo pair that exists for
+    its USD leg, plus a negative cache of tickers known not to be listed.
+
+    Only tickers yfinance explicitly reports as unlisted are cached as
+    missing; empty responses caused by upstream trouble leave the index
+    unchanged. A resolved leg is never evicted – if its ticker is reported
+    unlisted it is only skipped until that entry expires or another
+    direction resolves. Missing tickers expire after `missing_ttl` seconds
+    so newly listed symbols are picked up again.
+
+    State is saved as JSON at most every `save_interval` seconds from the
+    request path; `flush(force=True)` writes any remaining changes.
+    """
+
+    def __init__(self, path: str, missing_ttl: float = 86400.0, save_interval: float = 30.0):
+        self.path = path
+        self.missing_ttl = missing_ttl
+        self.save_interval = save_interval
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()     # keeps snapshots landing in order
+        self._dirty = False
+        self._saved_at = 0.0
+        self._legs: Dict[str, Dict] = {}        # code -> {"base", "quote", "checked_at"}
+        self._missing: Dict[str, float] = {}    # ticker -> expires_at (epoch seconds)
+
+        self._load()
+
+    # ---------------- persistence ---------------- #
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self._legs = data.get("legs", {})
+        self._missing = data.get("missing", {})
+
+    def _write(self, text: str):
+        # Unique temp file per write, so worker processes never share one
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".ticker_index.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(text)
+                os.replace(tmp, self.path)
+            except OSError:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            print(f"Could not persist ticker index: {e}")
+
+    def flush(self, force: bool = False):
+        """Write pending changes, unless the last write was under `save_interval` ago."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                if not force and time.time() - self._saved_at < self.save_interval:
+                    return
+                text = json.dumps(
+                    {"legs": self._legs, "missing": self._missing}, indent=2, sort_keys=True
+                )
+                self._dirty = False
+                self._saved_at = time.time()
+            self._write(text)
+
+    # ---------------- lookups ---------------- #
+
+    def usd_leg(self, code: str) -> Optional[FXPair]:
+        with self._lock:
+            leg = self._legs.get(code)
+        return FXPair(base=leg["base"], quote=leg["quote"]) if leg else None
+
+    def is_missing(self, ticker: str) -> bool:
+        with self._lock:
+            expires_at = self._missing.get(ticker)
+        return expires_at is not None and expires_at > time.time()
+
+    def candidates(self, code: str) -> List[FXPair]:
+        """USD-leg pairs worth trying for `code`, known-good first."""
+        known = self.usd_leg(code)
+        if known is not None and not self.is_missing(known.ticker()):
+            return [known]
+
+        pairs = [FXPair(base="USD", quote=code), FXPair(base=code, quote="USD")]
+        return [p for p in pairs if not self.is_missing(p.ticker())]
+
+    def supported(self) -> List[str]:
+        with self._lock:
+            return sorted(set(self._legs) | {"USD"})
+
+    # ---------------- updates ---------------- #
+
+    def _set_found(self, code: str, pair: FXPair):
+        self._missing.pop(pair.ticker(), None)
+        self._legs[code] = {"base": pair.base, "quote": pair.quote, "checked_at": time.time()}
+
+    def _set_missing(self, pair: FXPair):
+        self._missing[pair.ticker()] = time.time() + self.missing_ttl
+
+    def record_found(self, code: str, pair: FXPair):
+        with self._lock:
+            self._set_found(code, pair)
+            self._dirty = True
+        self.flush()
+
+    def record_missing(self, pair: FXPair):
+        with self._lock:
+            self._set_missing(pair)
+            self._dirty = True
+        self.flush()
+
+    # ---------------- resolution ---------------- #
+
+    def fetch_usd_leg(
+        self,
+        code: str,
+        fetcher: GuardedFXFetcher,
+        deadline: Optional[Deadline] = None
+    ) -> Tuple[FXPair, pd.Series]:
+        """
+        Fetch the history of `code`'s USD leg, trying only tickers that are
+        not known to be missing and recording what Yahoo actually lists.
+        Upstream errors (timeouts, open breaker, empty responses yfinance
+        does not attribute to the symbol) propagate without being recorded.
+        """
+        for pair in self.candidates(code):
+            try:
+                history = fetcher.fetch_daily(pair, deadline=deadline)
+            except TickerNotListedError:
+                self.record_missing(pair)
+                continue
+
+            if self.usd_leg(code) != pair:
+                self.record_found(code, pair)
+            return pair, history
+
+        raise NoDataError(f"Yahoo Finance lists no USD pair for '{code}'.")
+
+    def build(self, codes: Optional[List[str]] = None):
+        """
+        Bulk-probe every unresolved code in one yfinance call.
+        Intended to run once in the background at startup.
+        """
+        codes = codes or list(CURRENCY_NAMES)
+        probes = [p for code in codes if code != "USD" and self.usd_leg(code) is None
+                  for p in self.candidates(code)]
+        if not probes:
+            return
+
+        tickers = [p.ticker() for p in probes]
+        try:
+            df, errors = download_with_errors(
+                tickers=tickers,
+                period="5d",
+                interval="1d",
+                progress=False,
+                threads=False,
+            )
+            close = df["Close"]
+        except Exception as e:
+            print(f"Ticker index build failed: {e}")
+            return
+
+        if isinstance(close, pd.Series):
+            close = close.to_frame(tickers[0])
+        listed = {t for t in close.columns if close[t].notna().any()}
+
+        if not listed:
+            # Nothing at all came back – Yahoo is blocking us, not delisting everything
+            print("Ticker index build got no data; leaving index unchanged.")
+            return
+
+        with self._lock:
+            for pair in probes:
+                code = pair.quote if pair.base == "USD" else pair.base
+                ticker = pair.ticker()
+                if ticker in listed:
+                    if code not in self._legs:
+                        self._set_found(code, pair)
+                elif reported_unlisted(ticker, errors):
+                    # Anything else without data (rate limited, timed out)
+                    # is simply probed again on the next build
+                    self._set_missing(pair)
+            self._dirty = True
+        self.flush(force=True)
+
+        print(f"Ticker index built: {len(self._legs)} currencies resolved.")
+
+
+ticker_index: Optional[TickerIndex] = None
+
+
+def get_ticker_index() -> TickerIndex:
+    """Lazy initialization of the shared ticker index"""
+    global ticker_index
+    if ticker_index is None:
+        ticker_index = TickerIndex(
+            settings.FX_TICKER_INDEX_PATH,
+            missing_ttl=settings.FX_TICKER_MISSING_TTL_SECONDS,
+            save_interval=settings.FX_TICKER_INDEX_SAVE_SECONDS,
+        )
+    return ticker_index
@@ -0,0 +1,15 @@
+"""
+Load-testing harness for the TravelBudgetFX API.
+
+Runs the FastAPI app in-process behind httpx's ASGI transport, with every
+upstream (Yahoo Finance, open.er-api.com, Gemini, Supabase) replaced by a
+local stub whose latency and error rate can be configured.
+
+    cd backend
+    python -m loadtest --duration 30 --concurrency 50 \\
+        --latency yahoo=400 --error-rate yahoo=0.1 --latency gemini=1500
+
+See `python -m loadtest --help` for the traffic mix and report options.
+
+`python -m loadtest.bench_tft` benchmarks TFT inference paths separately.
+"""
@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from typing import Dict, List
+
+from loadtest.stubs import UPSTREAMS, UpstreamProfile, install_stubs
+
+
+def _parse_pairs(values: List[str], option: str) -> Dict[str, float]:
+    parsed = {}
+    for value in values or []:
+        name, _, number = value.partition("=")
+        if name not in UPSTREAMS or not number:
+            raise SystemExit(f"{option} expects NAME=VALUE with NAME in {', '.join(UPSTREAMS)}")
+        parsed[name] = float(number)
+    return parsed
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m loadtest",
+        description="Load-test the TravelBudgetFX API against local upstream stubs.",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load (default 30)")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent clients (default 20)")
+    parser.add_argument("--latency", action="append", metavar="NAME=MS",
+                        help=f"upstream latency in ms; NAME is one of {', '.join(UPSTREAMS)}")
+    parser.add_argument("--jitter", action="append", metavar="NAME=MS", help="± latency jitter in ms")
+    parser.add_argument("--error-rate", action="append", metavar="NAME=P",
+                        help="probability (0-1) that an upstream call fails")
+    parser.add_argument("--mix", help="scenario weights, e.g. forecast=3,rates=5,chat=1")
+    parser.add_argument("--slow-ms", type=float, default=50.0,
+                        help="callback duration counted as a slow loop block (default 50)")
+    parser.add_argument("--json", metavar="PATH", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    latency = _parse_pairs(args.latency, "--latency")
+    jitter = _parse_pairs(args.jitter, "--jitter")
+    errors = _parse_pairs(args.error_rate, "--error-rate")
+    profiles = {
+        name: UpstreamProfile(
+            latency_ms=latency.get(name, 0.0),
+            jitter_ms=jitter.get(name, 0.0),
+            error_rate=errors.get(name, 0.0),
+        )
+        for name in UPSTREAMS
+    }
+
+    # Keep the harness away from the real ticker index on disk
+    os.environ.setdefault(
+        "FX_TICKER_INDEX_PATH", os.path.join(tempfile.mkdtemp(prefix="loadtest-"), "ticker_index.json")
+    )
+
+    from main import app
+    from app.core.config import settings
+    from loadtest.runner import default_scenarios, format_report, run_load, summarize
+
+    install_stubs(profiles)
+
+    scenarios = default_scenarios(settings.API_V1_PREFIX)
+    if args.mix:
+        mix = _parse_mix(args.mix)
+        unknown = set(mix) - {s.name for s in scenarios}
+        if unknown:
+            raise SystemExit(f"Unknown scenarios in --mix: {', '.join(sorted(unknown))}")
+        for s in scenarios:
+            s.weight = mix.get(s.name, 0.0)
+        scenarios = [s for s in scenarios if s.weight > 0]
+
+    async def run():
+        async with app.router.lifespan_context(app):
+            return await run_load(app, scenarios, args.duration, args.concurrency, slow_ms=args.slow_ms)
+
+    stats, monitor, elapsed = asyncio.run(run())
+    rows = summarize(stats, monitor, elapsed)
+    print(format_report(rows, elapsed, monitor))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "duration_s": elapsed,
+                "concurrency": args.concurrency,
+                "profiles": {n: vars(p) for n, p in profiles.items()},
+                "routes": rows,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+TFT inference benchmark: latency and memory of the current per-pair
+`predict` path against the batched TFTInference path, with and without
+dynamic int8 quantization.
+
+    cd backend
+    python -m loadtest.bench_tft --pairs 8 --days 180 --threads 2
+
+A model is trained once on synthetic series and saved; each variant then
+runs in a fresh interpreter so RSS figures are not polluted by the others.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+VARIANTS = ("default", "batched", "batched_int8")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM is this process's own high-water mark; ru_maxrss is inherited
+    # across fork/exec, so every variant would report the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024   # kB
+    except (OSError, ValueError):
+        pass
+    return float("nan")
+
+
+def _synthetic_series(pairs: int, length: int):
+    from darts import TimeSeries
+
+    index = pd.date_range("2018-01-01", periods=length, freq="D")
+    rng = np.random.default_rng(7)
+    return [
+        TimeSeries.from_series(pd.Series(
+            np.exp(np.cumsum(rng.normal(0.0, 0.005, length))) * rng.uniform(0.5, 150),
+            index=index,
+        ).astype(np.float32))
+        for _ in range(pairs)
+    ]
+
+
+def train(args, path: str):
+    from darts.dataprocessing.transformers import Scaler
+    from app.models.fx_model import FXService
+
+    service = FXService(
+        input_chunk_length=args.input_chunk,
+        output_chunk_length=args.output_chunk,
+        n_epochs=args.epochs,
+        fast_inference=False,
+    )
+    series = _synthetic_series(args.pairs, args.history)
+    scaled = Scaler().fit_transform(series)
+
+    model = service._build_model()
+    start = time.perf_counter()
+    model.fit(scaled, verbose=False)
+    print(f"trained on {args.pairs} series in {time.perf_counter() - start:.1f}s")
+    model.save(path)
+
+
+def run_variant(args, path: str, variant: str) -> dict:
+    from darts.dataprocessing.transformers import Scaler
+    from darts.models import TFTModel
+    from app.models.tft_inference import TFTInference, configure_torch_threads
+
+    configure_torch_threads(args.threads)
+
+    model = TFTModel.load(path)
+    series = _synthetic_series(args.pairs, args.history)
+    scaler = Scaler()
+    scaled = scaler.fit_transform(series)
+    rss_loaded = _rss_mb()
+
+    if variant == "default":
+        # Current FXService path: one predict (and one Lightning trainer) per pair
+        def predict():
+            preds = [model.predict(args.days, series=s, random_state=0) for s in scaled]
+            return scaler.inverse_transform(preds)
+    else:
+        inference = TFTInference(model, quantize=(variant == "batched_int8"))
+
+        def predict():
+            return inference.predict(series, args.days, scaler, random_state=0)
+
+    predict()   # warm-up
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        preds = predict()
+        timings.append((time.perf_counter() - start) * 1000.0)
+
+    return {
+        "variant": variant,
+        "mean_ms": float(np.mean(timings)),
+        "p90_ms": float(np.percentile(timings, 90)),
+        "per_pair_ms": float(np.mean(timings)) / args.pairs,
+        "rss_loaded_mb": rss_loaded,
+        "rss_mb": _rss_mb(),
+        "peak_rss_mb": _peak_rss_mb(),
+        "values": [p.values().ravel().tolist() for p in preds],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m loadtest.bench_tft", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pairs", type=int, default=8)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--history", type=int, default=730, help="days of synthetic history per pair")
+    parser.add_argument("--input-chunk", type=int, default=365)
+    parser.add_argument("--output-chunk", type=int, default=180)
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = default)")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument("--model-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args, args.model_path, args.variant)))
+        return
+
+    with tempfile.TemporaryDirectory(prefix="bench-tft-") as tmp:
+        path = os.path.join(tmp, "tft.pt")
+        train(args, path)
+
+        passthrough = [a for a in sys.argv[1:] if not a.startswith("--json")]
+        if args.json:
+            passthrough = [a for a in passthrough if a != args.json]
+
+        results = []
+        for variant in VARIANTS:
+            out = subprocess.run(
+                [sys.executable, "-m", "loadtest.bench_tft", *passthrough,
+                 "--variant", variant, "--model-path", path],
+                capture_output=True, text=True, check=True,
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    # The TFT's quantile likelihood draws a random sample per predict call, so
+    # only variants sharing one batched call (and RNG stream) are comparable.
+    reference = np.asarray(results[1]["values"])
+    for r in results:
+        values = np.asarray(r.pop("values"))
+        r["max_rel_diff"] = (
+            float(np.max(np.abs(values - reference) / np.abs(reference)))
+            if r["variant"] != "default" else None
+        )
+
+    print(f"{'variant':<14}{'mean ms':>10}{'p90 ms':>10}{'ms/pair':>10}"
+          f"{'RSS load':>10}{'RSS':>8}{'peak':>8}{'max rel Δ':>11}")
+    for r in results:
+        diff = f"{r['max_rel_diff']:.2e}" if r["max_rel_diff"] is not None else "-"
+        print(f"{r['variant']:<14}{r['mean_ms']:>10.1f}{r['p90_ms']:>10.1f}{r['per_pair_ms']:>10.1f}"
+              f"{r['rss_loaded_mb']:>10.0f}{r['rss_mb']:>8.0f}{r['peak_rss_mb']:>8.0f}{diff:>11}")
+    print(f"{args.pairs} pairs × {args.days} days, {args.repeats} repeats; "
+          f"RSS in MB; max rel Δ is against fp32 batched.")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
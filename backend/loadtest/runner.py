@@ -0,0 +1,231 @@
+# Async load generator with per-route latency and event-loop blocking stats
+import asyncio
+import contextvars
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+
+# Route label of the request currently being served by this task
+_current_route: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "loadtest_route", default=None
+)
+
+FORECAST_PAIRS = [("JPY", "USD"), ("EUR", "INR"), ("GBP", "JPY"), ("AUD", "CAD"),
+                  ("THB", "SGD"), ("AFN", "INR"), ("VND", "EUR")]
+RATE_BASES = ["USD", "EUR", "GBP", "JPY", "INR"]
+FORECAST_MODELS = ["trend", "ewma", "ar", "garch"]
+
+
+# ============================================================
+#  Traffic mix
+# ============================================================
+@dataclass
+class Scenario:
+    name: str
+    weight: float
+    build: Callable[[], Tuple[str, str, Dict]]   # -> (method, path, request kwargs)
+
+
+def default_scenarios(prefix: str) -> List[Scenario]:
+    def forecast():
+        base, target = random.choice(FORECAST_PAIRS)
+        return "POST", f"{prefix}/forecasts/currency", {"params": {
+            "base_currency": base,
+            "target_currency": target,
+            "days": 30,
+            "model": random.choice(FORECAST_MODELS),
+        }}
+
+    def rates():
+        return "GET", f"{prefix}/currencies/rates", {"params": {"base_currency": random.choice(RATE_BASES)}}
+
+    def supported():
+        return "GET", f"{prefix}/currencies/supported", {}
+
+    def chat():
+        return "POST", f"{prefix}/chat", {"json": {"message": "What should I pack for Tokyo in March?"}}
+
+    def budget_create():
+        return "POST", f"{prefix}/budgets/", {"json": {
+            "title": "Load test trip",
+            "start_date": "2026-03-01T00:00:00",
+            "end_date": "2026-03-10T00:00:00",
+            "base_currency": "USD",
+            "target_currencies": ["JPY"],
+        }}
+
+    def budget_list():
+        return "GET", f"{prefix}/budgets/", {}
+
+    return [
+        Scenario("forecast", 3, forecast),
+        Scenario("rates", 5, rates),
+        Scenario("supported", 1, supported),
+        Scenario("chat", 1, chat),
+        Scenario("budget_create", 1, budget_create),
+        Scenario("budget_list", 2, budget_list),
+    ]
+
+
+# ============================================================
+#  Event-loop blocking monitor
+# ============================================================
+class LoopBlockMonitor:
+    """
+    Times every callback the event loop runs and charges it to the route
+    label found in the callback's context. Task steps run in their task's
+    context, so time spent inside a request handler – including sync calls
+    that block the loop – is attributed to that handler's route.
+    """
+
+    def __init__(self, slow_ms: float = 50.0):
+        self.slow_ms = slow_ms
+        self.total: Dict[str, float] = defaultdict(float)
+        self.longest: Dict[str, float] = defaultdict(float)
+        self.slow: Dict[str, int] = defaultdict(int)
+        self._original = None
+
+    def install(self):
+        handle_cls = asyncio.events.Handle
+        self._original = original = handle_cls._run
+        monitor = self
+
+        def timed_run(handle):
+            # Read the label before running: a task step that finishes one
+            # request may already have set the label of the next one.
+            context = getattr(handle, "_context", None)
+            route = context.get(_current_route) if context is not None else None
+            start = time.perf_counter()
+            try:
+                original(handle)
+            finally:
+                monitor.record(route or "<other>", (time.perf_counter() - start) * 1000.0)
+
+        handle_cls._run = timed_run
+
+    def uninstall(self):
+        if self._original is not None:
+            asyncio.events.Handle._run = self._original
+            self._original = None
+
+    def record(self, route: str, elapsed_ms: float):
+        self.total[route] += elapsed_ms
+        self.longest[route] = max(self.longest[route], elapsed_ms)
+        if elapsed_ms >= self.slow_ms:
+            self.slow[route] += 1
+
+
+# ============================================================
+#  Load generator
+# ============================================================
+@dataclass
+class RouteStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: Dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+async def run_load(
+    app,
+    scenarios: List[Scenario],
+    duration: float,
+    concurrency: int,
+    timeout: float = 60.0,
+    slow_ms: float = 50.0,
+) -> Tuple[Dict[str, RouteStats], LoopBlockMonitor, float]:
+    """
+    Closed-loop load: `concurrency` workers each send the next request as
+    soon as the previous one finishes, for `duration` seconds.
+    """
+    stats: Dict[str, RouteStats] = defaultdict(RouteStats)
+    weights = [s.weight for s in scenarios]
+    monitor = LoopBlockMonitor(slow_ms)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+        stop_at = time.perf_counter() + duration
+
+        async def worker():
+            while time.perf_counter() < stop_at:
+                scenario = random.choices(scenarios, weights)[0]
+                method, path, kwargs = scenario.build()
+                route = stats[scenario.name]
+
+                # Yield once so the next loop step starts under the new label
+                _current_route.set(scenario.name)
+                await asyncio.sleep(0)
+
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    route.statuses[response.status_code] += 1
+                    if response.status_code >= 400:
+                        route.errors += 1
+                except Exception:
+                    route.statuses[0] += 1
+                    route.errors += 1
+                finally:
+                    route.latencies_ms.append((time.perf_counter() - start) * 1000.0)
+
+        monitor.install()
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            monitor.uninstall()
+        elapsed = time.perf_counter() - started
+
+    return stats, monitor, elapsed
+
+
+# ============================================================
+#  Report
+# ============================================================
+def summarize(stats: Dict[str, RouteStats], monitor: LoopBlockMonitor, elapsed: float) -> List[Dict]:
+    rows = []
+    for name in sorted(stats):
+        s = stats[name]
+        lat = np.asarray(s.latencies_ms) if s.latencies_ms else np.zeros(1)
+        rows.append({
+            "route": name,
+            "requests": len(s.latencies_ms),
+            "errors": s.errors,
+            "rps": len(s.latencies_ms) / elapsed if elapsed else 0.0,
+            "p50_ms": float(np.percentile(lat, 50)),
+            "p90_ms": float(np.percentile(lat, 90)),
+            "p99_ms": float(np.percentile(lat, 99)),
+            "max_ms": float(lat.max()),
+            "loop_blocked_ms": monitor.total.get(name, 0.0),
+            "longest_block_ms": monitor.longest.get(name, 0.0),
+            "slow_callbacks": monitor.slow.get(name, 0),
+            "statuses": dict(s.statuses),
+        })
+    return rows
+
+
+def format_report(rows: List[Dict], elapsed: float, monitor: LoopBlockMonitor) -> str:
+    header = (f"{'route':<14}{'reqs':>7}{'errs':>6}{'rps':>8}{'p50':>9}{'p90':>9}"
+              f"{'p99':>9}{'max':>9}{'blocked':>10}{'longest':>9}{'slow':>6}")
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['route']:<14}{r['requests']:>7}{r['errors']:>6}{r['rps']:>8.1f}"
+            f"{r['p50_ms']:>9.0f}{r['p90_ms']:>9.0f}{r['p99_ms']:>9.0f}{r['max_ms']:>9.0f}"
+            f"{r['loop_blocked_ms']:>10.0f}{r['longest_block_ms']:>9.0f}{r['slow_callbacks']:>6}"
+        )
+
+    total = sum(r["requests"] for r in rows)
+    blocked = sum(monitor.total.values())
+    lines.append("-" * len(header))
+    lines.append(
+        f"{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s); "
+        f"event loop busy {blocked / 10 / elapsed:.1f}% of wall time. "
+        f"Latencies in ms; 'slow' = callbacks over {monitor.slow_ms:.0f} ms."
+    )
+    return "\n".join(lines)
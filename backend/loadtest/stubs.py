@@ -0,0 +1,250 @@
+# In-process stand-ins for every upstream the API talks to
+import asyncio
+import logging
+import random
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class UpstreamProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+    def delay(self) -> float:
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def fails(self) -> bool:
+        return random.random() < self.error_rate
+
+
+UPSTREAMS = ("yahoo", "rates", "gemini", "supabase")
+
+# USD price of one unit of each stubbed currency
+USD_PRICES: Dict[str, float] = {
+    "USD": 1.0, "EUR": 1.08, "GBP": 1.27, "JPY": 0.0067, "AUD": 0.66, "CAD": 0.74,
+    "CHF": 1.12, "CNY": 0.14, "HKD": 0.128, "NZD": 0.61, "SEK": 0.095, "KRW": 0.00075,
+    "SGD": 0.74, "NOK": 0.094, "MXN": 0.058, "INR": 0.012, "BRL": 0.2, "ZAR": 0.054,
+    "THB": 0.028, "TRY": 0.031, "AFN": 0.014, "VND": 0.00004,
+}
+
+
+# ============================================================
+#  Yahoo Finance – replaces yfinance.download (blocking, like the real one)
+# ============================================================
+class YahooStub:
+    # yfinance swallows per-ticker errors and logs them on its own logger
+    logger = logging.getLogger("yfinance")
+
+    def __init__(self, profile: UpstreamProfile):
+        self.profile = profile
+
+    @staticmethod
+    def _history(ticker: str, index: pd.DatetimeIndex) -> Optional[np.ndarray]:
+        # Ticker format is QUOTE + BASE + "=X", priced as BASE per QUOTE
+        quote, base = ticker[:3], ticker[3:6]
+        if quote not in USD_PRICES or base not in USD_PRICES or quote == base:
+            return None
+
+        level = USD_PRICES[quote] / USD_PRICES[base]
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        walk = np.cumsum(rng.normal(0.0, 0.004, len(index)))
+        return level * np.exp(walk - walk[-1])
+
+    def download(self, tickers, start=None, end=None, period=None, **kwargs) -> pd.DataFrame:
+        time.sleep(self.profile.delay())
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        if self.profile.fails():
+            self.logger.error(f"{symbols}: ReadTimeout('stubbed Yahoo failure')")
+            return pd.DataFrame()
+
+        end = pd.Timestamp(end or datetime.utcnow()).normalize()
+        start = pd.Timestamp(start).normalize() if start is not None else end - timedelta(days=5)
+        index = pd.bdate_range(start, end)
+
+        columns = {}
+        for ticker in symbols:
+            values = self._history(ticker, index)
+            if values is None:
+                self.logger.error(
+                    f"['{ticker}']: YFTzMissingError('${ticker}: possibly delisted; no timezone found')"
+                )
+                values = np.full(len(index), np.nan)
+            columns[("Close", ticker)] = values
+
+        if isinstance(tickers, str):
+            if np.isnan(columns[("Close", tickers)]).all():
+                return pd.DataFrame()
+            return pd.DataFrame({"Close": columns[("Close", tickers)]}, index=index)
+        return pd.DataFrame(columns, index=index)
+
+
+# ============================================================
+#  open.er-api.com – served through an httpx MockTransport (async)
+# ============================================================
+class RatesStub:
+    def __init__(self, profile: UpstreamProfile):
+        self.profile = profile
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.profile.delay())
+        if self.profile.fails():
+            return httpx.Response(503, json={"result": "error"})
+
+        base = request.url.path.rsplit("/", 1)[-1].upper()
+        if base not in USD_PRICES:
+            return httpx.Response(404, json={"result": "error", "error-type": "unsupported-code"})
+
+        noise = 1.0 + random.uniform(-0.0005, 0.0005)
+        rates = {code: USD_PRICES[base] / price * noise for code, price in USD_PRICES.items()}
+        return httpx.Response(200, json={
+            "result": "success",
+            "base_code": base,
+            "time_last_update_unix": int(time.time()),
+            "rates": rates,
+        })
+
+    def client_class(self):
+        handler = self.handle
+        real_client = httpx.AsyncClient
+
+        class StubAsyncClient(real_client):
+            # Only clients built without an explicit transport are redirected
+            def __init__(self, *args, transport=None, **kwargs):
+                super().__init__(*args, transport=transport or httpx.MockTransport(handler), **kwargs)
+
+        return StubAsyncClient
+
+
+# ============================================================
+#  Gemini – the real SDK call is synchronous, so the stub blocks too
+# ============================================================
+class _GeminiResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _GeminiChat:
+    def __init__(self, model: "GeminiStub"):
+        self.model = model
+
+    def send_message(self, message: str) -> _GeminiResponse:
+        return self.model.generate_content(message)
+
+
+class GeminiStub:
+    def __init__(self, profile: UpstreamProfile):
+        self.profile = profile
+
+    def generate_content(self, prompt: str) -> _GeminiResponse:
+        time.sleep(self.profile.delay())
+        if self.profile.fails():
+            raise RuntimeError("Gemini stub: injected failure")
+        return _GeminiResponse(f"Stub itinerary for a {len(prompt)}-character prompt.")
+
+    def start_chat(self, history: Optional[List] = None) -> _GeminiChat:
+        return _GeminiChat(self)
+
+
+# ============================================================
+#  Supabase – in-memory tables behind the sync query-builder API
+# ============================================================
+class _Result:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, stub: "SupabaseStub", table: str):
+        self.stub = stub
+        self.rows = stub.tables.setdefault(table, {})
+        self._insert: Optional[Dict] = None
+        self._filters: List = []
+        self._single = False
+
+    def insert(self, data: Dict) -> "_Query":
+        self._insert = data
+        return self
+
+    def select(self, columns: str = "*") -> "_Query":
+        return self
+
+    def eq(self, column: str, value) -> "_Query":
+        self._filters.append((column, value))
+        return self
+
+    def single(self) -> "_Query":
+        self._single = True
+        return self
+
+    def execute(self) -> _Result:
+        time.sleep(self.stub.profile.delay())
+        if self.stub.profile.fails():
+            raise RuntimeError("Supabase stub: injected failure")
+
+        if self._insert is not None:
+            now = datetime.utcnow().isoformat()
+            row = {
+                "created_at": now,
+                "updated_at": now,
+                "estimated_total": 0,
+                "actual_total": None,
+                **self._insert,
+            }
+            row.setdefault("id", str(uuid.uuid4()))
+            self.rows[row["id"]] = row
+            return _Result([row])
+
+        rows = [r for r in self.rows.values()
+                if all(str(r.get(c)) == str(v) for c, v in self._filters)]
+        if self._single:
+            if len(rows) != 1:
+                raise RuntimeError("Supabase stub: expected a single row")
+            return _Result(rows[0])
+        return _Result(rows)
+
+
+class SupabaseStub:
+    def __init__(self, profile: UpstreamProfile):
+        self.profile = profile
+        self.tables: Dict[str, Dict[str, Dict]] = {}
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+
+# ============================================================
+#  Installation
+# ============================================================
+def install_stubs(profiles: Dict[str, UpstreamProfile]) -> Dict[str, object]:
+    """
+    Patch every upstream client the app uses. Must run after the app
+    modules are imported; returns the stub instances by upstream name.
+    """
+    import yfinance
+    from app.api.v1 import chat
+    from app.core import supabase as supabase_module
+
+    stubs = {
+        "yahoo": YahooStub(profiles["yahoo"]),
+        "rates": RatesStub(profiles["rates"]),
+        "gemini": GeminiStub(profiles["gemini"]),
+        "supabase": SupabaseStub(profiles["supabase"]),
+    }
+
+    yfinance.download = stubs["yahoo"].download
+    httpx.AsyncClient = stubs["rates"].client_class()
+    chat.get_model = lambda: stubs["gemini"]
+    supabase_module.supabase = stubs["supabase"]
+
+    return stubs
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
@@ -18,12 +19,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend (another origin) read the stale-history marker
+    expose_headers=["X-FX-Stale"],
 )
 
 # Import and include routers
 from app.api.v1.api import api_router
+from app.core.rate_hub import get_rate_hub
+from app.models.ticker_index import get_ticker_index
+from app.models.tft_inference import configure_torch_threads
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
+# Keep torch from oversubscribing cores shared with other uvicorn workers
+configure_torch_threads(settings.TORCH_NUM_THREADS, settings.TORCH_INTEROP_THREADS)
+
+@app.on_event("startup")
+async def build_ticker_index():
+    # Resolve Yahoo tickers for all known currencies in the background
+    asyncio.get_event_loop().run_in_executor(None, get_ticker_index().build)
+
+@app.on_event("shutdown")
+async def close_rate_hub():
+    await get_rate_hub().close()
+
+@app.on_event("shutdown")
+async def flush_ticker_index():
+    # Persist resolutions recorded since the last debounced save
+    get_ticker_index().flush(force=True)
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to TravelBudgetFX API"}
\ No newline at end of file